@@ -1,13 +1,50 @@
+from typing import TYPE_CHECKING
+
 from browser_use.logging_config import setup_logging
 
 setup_logging()
 
-from browser_use.agent.prompts import SystemPrompt
-from browser_use.agent.service import Agent
-from browser_use.agent.views import ActionModel, ActionResult, AgentHistoryList
-from browser_use.browser import Browser, BrowserConfig, BrowserContext, BrowserContextConfig, BrowserProfile, BrowserSession
-from browser_use.controller.service import Controller
-from browser_use.dom.service import DomService
+# Type stubs for lazy imports, lets IDEs and type checkers see the real symbols
+if TYPE_CHECKING:
+	from browser_use.agent.prompts import SystemPrompt
+	from browser_use.agent.service import Agent
+	from browser_use.agent.views import ActionModel, ActionResult, AgentHistoryList
+	from browser_use.browser import Browser, BrowserConfig, BrowserContext, BrowserContextConfig, BrowserProfile, BrowserSession
+	from browser_use.controller.service import Controller
+	from browser_use.dom.service import DomService
+
+# Lazy imports mapping, the heavy modules (langchain, playwright, pydantic models, etc.) are only
+# imported the first time one of their symbols is actually accessed, see PEP 562
+_LAZY_IMPORTS = {
+	'Agent': 'browser_use.agent.service',
+	'SystemPrompt': 'browser_use.agent.prompts',
+	'ActionModel': 'browser_use.agent.views',
+	'ActionResult': 'browser_use.agent.views',
+	'AgentHistoryList': 'browser_use.agent.views',
+	'Browser': 'browser_use.browser',
+	'BrowserConfig': 'browser_use.browser',
+	'BrowserContext': 'browser_use.browser',
+	'BrowserContextConfig': 'browser_use.browser',
+	'BrowserProfile': 'browser_use.browser',
+	'BrowserSession': 'browser_use.browser',
+	'Controller': 'browser_use.controller.service',
+	'DomService': 'browser_use.dom.service',
+}
+
+
+def __getattr__(name: str):
+	"""Lazily import the public symbols on first access"""
+	if name in _LAZY_IMPORTS:
+		from importlib import import_module
+
+		module = import_module(_LAZY_IMPORTS[name])
+		attr = getattr(module, name)
+		# cache it on the package so later lookups skip __getattr__ entirely
+		globals()[name] = attr
+		return attr
+
+	raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
 
 __all__ = [
 	'Agent',
@@ -22,6 +22,9 @@ MODELS_WITHOUT_TOOL_SUPPORT_PATTERNS = [
 	'.*gemma.*-it',
 ]
 
+# body of the first ``` fenced block minus the fence line (language tag), tolerates a missing closing fence (e.g. truncated output)
+_CODE_BLOCK_RE = re.compile(r'```(?:[^\n`]*\n)?(.*?)(?:```|\Z)', re.DOTALL)
+
 
 def is_model_without_tool_support(model_name: str) -> bool:
 	return any(re.match(pattern, model_name) for pattern in MODELS_WITHOUT_TOOL_SUPPORT_PATTERNS)
@@ -30,13 +33,9 @@ def is_model_without_tool_support(model_name: str) -> bool:
 def extract_json_from_model_output(content: str) -> dict:
 	"""Extract JSON from model output, handling both plain JSON and code-block-wrapped JSON."""
 	try:
-		# If content is wrapped in code blocks, extract just the JSON part
-		if '```' in content:
-			# Find the JSON content between code blocks
-			content = content.split('```')[1]
-			# Remove language identifier if present (e.g., 'json\n')
-			if '\n' in content:
-				content = content.split('\n', 1)[1]
+		# If content is wrapped in code blocks, extract just the JSON part (minus any language identifier e.g. 'json\n')
+		if match := _CODE_BLOCK_RE.search(content):
+			content = match.group(1)
 		# Parse the cleaned content
 		result_dict = json.loads(content)
 
@@ -134,7 +133,8 @@ def _write_messages_to_file(f: Any, messages: list[BaseMessage]) -> None:
 		elif isinstance(message.content, str):
 			try:
 				content = json.loads(message.content)
-				f.write(json.dumps(content, indent=2) + '\n')
+				json.dump(content, f, indent=2)  # stream straight into the file instead of building the whole string first
+				f.write('\n')
 			except json.JSONDecodeError:
 				f.write(message.content.strip() + '\n')
 
@@ -144,4 +144,6 @@ def _write_messages_to_file(f: Any, messages: list[BaseMessage]) -> None:
 def _write_response_to_file(f: Any, response: Any) -> None:
 	"""Write model response to conversation file"""
 	f.write(' RESPONSE\n')
-	f.write(json.dumps(json.loads(response.model_dump_json(exclude_unset=True)), indent=2))
+	# dump to JSON-compatible python objects directly instead of a model_dump_json -> loads round-trip, json.dump keeps the
+	# output ASCII-escaped like the messages above, so it can be written with any save_conversation_path_encoding
+	json.dump(response.model_dump(mode='json', exclude_unset=True), f, indent=2)
@@ -8,11 +8,12 @@ import os
 import re
 import time
 from dataclasses import dataclass
-from functools import wraps
+from functools import lru_cache, wraps
 from pathlib import Path
 from typing import Any, Self
 from urllib.parse import urlparse
 
+import anyio
 import psutil
 from patchright.async_api import Playwright as PatchrightPlaywright
 from playwright.async_api import Browser as PlaywrightBrowser
@@ -38,6 +39,50 @@ IN_DOCKER = os.environ.get('IN_DOCKER', 'false').lower()[0] in 'ty1'
 logger = logging.getLogger('browser_use.browser.session')
 
 
+# precompiled patterns used when building CSS selectors in BrowserSession._build_enhanced_css_selector()
+_VALID_CSS_CLASS_NAME_RE = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_-]*$')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Expanded set of safe attributes that are stable and useful for selection, see BrowserSession._build_enhanced_css_selector()
+_SAFE_ATTRIBUTES = frozenset(
+	{
+		# Data attributes (if they're stable in your application)
+		'id',
+		# Standard HTML attributes
+		'name',
+		'type',
+		'placeholder',
+		# Accessibility attributes
+		'aria-label',
+		'aria-labelledby',
+		'aria-describedby',
+		'role',
+		# Common form attributes
+		'for',
+		'autocomplete',
+		'required',
+		'readonly',
+		# Media attributes
+		'alt',
+		'title',
+		'src',
+		# Custom stable attributes (add any application-specific ones)
+		'href',
+		'target',
+	}
+)
+
+# test-id style attributes, only used when include_dynamic_attributes=True
+_DYNAMIC_ATTRIBUTES = frozenset(
+	{
+		'data-id',
+		'data-qa',
+		'data-cy',
+		'data-testid',
+	}
+)
+_SAFE_AND_DYNAMIC_ATTRIBUTES = _SAFE_ATTRIBUTES | _DYNAMIC_ATTRIBUTES
+
 _GLOB_WARNING_SHOWN = False  # used inside _is_url_allowed to avoid spamming the logs with the same warning multiple times
 
 
@@ -375,8 +420,13 @@ class BrowserSession(BaseModel):
 
 	async def setup_new_browser_context(self) -> None:
 		"""Launch a new browser and browser_context"""
+		# only walk our child processes when we are actually about to launch a local browser below,
+		# children(recursive=True) scans /proc synchronously and is wasted work when connecting to an existing browser
+		launching_new_browser = not (self.browser or self.browser_context)
 		current_process = psutil.Process(os.getpid())
-		child_pids_before_launch = {child.pid for child in current_process.children(recursive=True)}
+		child_pids_before_launch = (
+			{child.pid for child in current_process.children(recursive=True)} if launching_new_browser else set()
+		)
 
 		# if we have a browser object but no browser_context, use the first context discovered or make a new one
 		if self.browser and not self.browser_context:
@@ -433,14 +483,19 @@ class BrowserSession(BaseModel):
 		# playwright does not give us a browser object at all when we use launch_persistent_context()!
 
 		# Detect any new child chrome processes that we might have launched above
-		try:
-			child_pids_after_launch = {child.pid for child in current_process.children(recursive=True)}
-			new_child_pids = child_pids_after_launch - child_pids_before_launch
-			new_child_procs = [psutil.Process(pid) for pid in new_child_pids]
-			new_chrome_procs = [proc for proc in new_child_procs if 'Helper' not in proc.name() and proc.status() == 'running']
-		except Exception as e:
-			logger.debug(f'❌ Error trying to find child chrome processes after launching new browser: {type(e).__name__}: {e}')
-			new_chrome_procs = []
+		new_chrome_procs = []
+		if launching_new_browser:
+			try:
+				child_pids_after_launch = {child.pid for child in current_process.children(recursive=True)}
+				new_child_pids = child_pids_after_launch - child_pids_before_launch
+				new_child_procs = [psutil.Process(pid) for pid in new_child_pids]
+				new_chrome_procs = [
+					proc for proc in new_child_procs if 'Helper' not in proc.name() and proc.status() == 'running'
+				]
+			except Exception as e:
+				logger.debug(
+					f'❌ Error trying to find child chrome processes after launching new browser: {type(e).__name__}: {e}'
+				)
 
 		if new_chrome_procs and not self.browser_pid:
 			self.browser_pid = new_chrome_procs[0].pid
@@ -950,8 +1005,9 @@ class BrowserSession(BaseModel):
 				out_path = Path(out_path)
 				if not out_path.is_absolute():
 					out_path = Path(self.browser_profile.downloads_dir) / out_path
-				out_path.parent.mkdir(parents=True, exist_ok=True)
-				out_path.write_text(json.dumps(cookies, indent=4))  # TODO: replace with anyio asyncio or anyio write
+				# save_cookies runs as a background task after every state update, keep the disk I/O off the event loop
+				await anyio.Path(out_path.parent).mkdir(parents=True, exist_ok=True)
+				await anyio.Path(out_path).write_text(json.dumps(cookies, indent=4))
 
 	# @property
 	# def browser_extension_pages(self) -> list[Page]:
@@ -1541,6 +1597,7 @@ class BrowserSession(BaseModel):
 		return new_filename
 
 	@staticmethod
+	@lru_cache(maxsize=4096)  # pure function of the xpath string, the same xpaths come up again on every state update
 	def _convert_simple_xpath_to_css_selector(xpath: str) -> str:
 		"""Converts simple XPath expressions to CSS selectors."""
 		if not xpath:
@@ -1610,102 +1667,80 @@ class BrowserSession(BaseModel):
 				A valid CSS selector string
 		"""
 		try:
-			# Get base selector from XPath
-			css_selector = cls._convert_simple_xpath_to_css_selector(element.xpath)
-
-			# Handle class attributes
-			if 'class' in element.attributes and element.attributes['class'] and include_dynamic_attributes:
-				# Define a regex pattern for valid class names in CSS
-				valid_class_name_pattern = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_-]*$')
-
-				# Iterate through the class attribute values
-				classes = element.attributes['class'].split()
-				for class_name in classes:
-					# Skip empty class names
-					if not class_name.strip():
-						continue
-
-					# Check if the class name is valid
-					if valid_class_name_pattern.match(class_name):
-						# Append the valid class name to the CSS selector
-						css_selector += f'.{class_name}'
-					else:
-						# Skip invalid class names
-						continue
-
-			# Expanded set of safe attributes that are stable and useful for selection
-			SAFE_ATTRIBUTES = {
-				# Data attributes (if they're stable in your application)
-				'id',
-				# Standard HTML attributes
-				'name',
-				'type',
-				'placeholder',
-				# Accessibility attributes
-				'aria-label',
-				'aria-labelledby',
-				'aria-describedby',
-				'role',
-				# Common form attributes
-				'for',
-				'autocomplete',
-				'required',
-				'readonly',
-				# Media attributes
-				'alt',
-				'title',
-				'src',
-				# Custom stable attributes (add any application-specific ones)
-				'href',
-				'target',
-			}
-
-			if include_dynamic_attributes:
-				dynamic_attributes = {
-					'data-id',
-					'data-qa',
-					'data-cy',
-					'data-testid',
-				}
-				SAFE_ATTRIBUTES.update(dynamic_attributes)
+			# only pass the attributes the selector can actually use, so the cache key doesn't hold on to style, inline handlers,
+			# etc. and elements that only differ in those attributes share a cache entry
+			used_attributes = _SAFE_AND_DYNAMIC_ATTRIBUTES if include_dynamic_attributes else _SAFE_ATTRIBUTES
+			attribute_items = tuple(
+				(name, value) for name, value in element.attributes.items() if name == 'class' or name in used_attributes
+			)
+			return cls._build_enhanced_css_selector(element.xpath, attribute_items, include_dynamic_attributes)
+		except Exception:
+			# Fallback to a more basic selector if something goes wrong
+			tag_name = element.tag_name or '*'
+			return f"{tag_name}[highlight_index='{element.highlight_index}']"
 
-			# Handle other attributes
-			for attribute, value in element.attributes.items():
-				if attribute == 'class':
+	@classmethod
+	@lru_cache(maxsize=8192)
+	def _build_enhanced_css_selector(
+		cls, xpath: str, attribute_items: tuple[tuple[str, str], ...], include_dynamic_attributes: bool
+	) -> str:
+		"""Cached implementation of _enhanced_css_selector_for_element, keyed by the xpath + the selector-relevant attributes"""
+		attributes = dict(attribute_items)
+
+		# Get base selector from XPath
+		css_selector = cls._convert_simple_xpath_to_css_selector(xpath)
+
+		# Handle class attributes
+		if 'class' in attributes and attributes['class'] and include_dynamic_attributes:
+			# Iterate through the class attribute values
+			classes = attributes['class'].split()
+			for class_name in classes:
+				# Skip empty class names
+				if not class_name.strip():
 					continue
 
-				# Skip invalid attribute names
-				if not attribute.strip():
+				# Check if the class name is valid
+				if _VALID_CSS_CLASS_NAME_RE.match(class_name):
+					# Append the valid class name to the CSS selector
+					css_selector += f'.{class_name}'
+				else:
+					# Skip invalid class names
 					continue
 
-				if attribute not in SAFE_ATTRIBUTES:
-					continue
+		safe_attributes = _SAFE_AND_DYNAMIC_ATTRIBUTES if include_dynamic_attributes else _SAFE_ATTRIBUTES
 
-				# Escape special characters in attribute names
-				safe_attribute = attribute.replace(':', r'\:')
-
-				# Handle different value cases
-				if value == '':
-					css_selector += f'[{safe_attribute}]'
-				elif any(char in value for char in '"\'<>`\n\r\t'):
-					# Use contains for values with special characters
-					# For newline-containing text, only use the part before the newline
-					if '\n' in value:
-						value = value.split('\n')[0]
-					# Regex-substitute *any* whitespace with a single space, then strip.
-					collapsed_value = re.sub(r'\s+', ' ', value).strip()
-					# Escape embedded double-quotes.
-					safe_value = collapsed_value.replace('"', '\\"')
-					css_selector += f'[{safe_attribute}*="{safe_value}"]'
-				else:
-					css_selector += f'[{safe_attribute}="{value}"]'
+		# Handle other attributes
+		for attribute, value in attributes.items():
+			if attribute == 'class':
+				continue
 
-			return css_selector
+			# Skip invalid attribute names
+			if not attribute.strip():
+				continue
 
-		except Exception:
-			# Fallback to a more basic selector if something goes wrong
-			tag_name = element.tag_name or '*'
-			return f"{tag_name}[highlight_index='{element.highlight_index}']"
+			if attribute not in safe_attributes:
+				continue
+
+			# Escape special characters in attribute names
+			safe_attribute = attribute.replace(':', r'\:')
+
+			# Handle different value cases
+			if value == '':
+				css_selector += f'[{safe_attribute}]'
+			elif any(char in value for char in '"\'<>`\n\r\t'):
+				# Use contains for values with special characters
+				# For newline-containing text, only use the part before the newline
+				if '\n' in value:
+					value = value.split('\n')[0]
+				# Regex-substitute *any* whitespace with a single space, then strip.
+				collapsed_value = _WHITESPACE_RE.sub(' ', value).strip()
+				# Escape embedded double-quotes.
+				safe_value = collapsed_value.replace('"', '\\"')
+				css_selector += f'[{safe_attribute}*="{safe_value}"]'
+			else:
+				css_selector += f'[{safe_attribute}="{value}"]'
+
+		return css_selector
 
 	@require_initialization
 	@time_execution_async('--is_visible')
@@ -1,4 +1,5 @@
 import logging
+import sys
 from dataclasses import dataclass
 from importlib import resources
 from typing import TYPE_CHECKING
@@ -199,10 +200,11 @@ class DomService:
 				height=node_data['viewport']['height'],
 			)
 
+		# tag names and attribute names repeat across thousands of nodes, intern them so every node shares one copy
 		element_node = DOMElementNode(
-			tag_name=node_data['tagName'],
+			tag_name=sys.intern(node_data['tagName']),
 			xpath=node_data['xpath'],
-			attributes=node_data.get('attributes', {}),
+			attributes={sys.intern(key): value for key, value in node_data.get('attributes', {}).items()},
 			children=[],
 			is_visible=node_data.get('isVisible', False),
 			is_interactive=node_data.get('isInteractive', False),
@@ -1,6 +1,4 @@
 import asyncio
-import http
-import json
 import os
 import sys
 
@@ -12,6 +10,8 @@ load_dotenv()
 
 import logging
 
+import httpx
+import orjson
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel
 
@@ -36,26 +36,31 @@ if not SERP_API_KEY:
 
 controller = Controller(exclude_actions=['search_google'], output_model=PersonList)
 
+# one shared keep-alive client, so repeated searches reuse the same TLS connection instead of re-handshaking per query
+serper_client = httpx.AsyncClient(
+	base_url='https://google.serper.dev',
+	headers={'X-API-KEY': SERP_API_KEY, 'Content-Type': 'application/json'},
+	timeout=10,
+)
+
 
 @controller.registry.action('Search the web for a specific query')
 async def search_web(query: str):
 	# do a serp search for the query
-	conn = http.client.HTTPSConnection('google.serper.dev')
-	payload = json.dumps({'q': query})
-	headers = {'X-API-KEY': SERP_API_KEY, 'Content-Type': 'application/json'}
-	conn.request('POST', '/search', payload, headers)
-	res = conn.getresponse()
-	data = res.read()
-	serp_data = json.loads(data.decode('utf-8'))
+	response = await serper_client.post('/search', json={'q': query})
+	response.raise_for_status()
+	# orjson parses the raw response bytes directly, no intermediate .decode('utf-8') str copy
+	serp_data = orjson.loads(response.content)
 
 	# exclude searchParameters and credits
-	serp_data = {k: v for k, v in serp_data.items() if k not in ['searchParameters', 'credits']}
+	serp_data = {k: v for k, v in serp_data.items() if k not in ('searchParameters', 'credits')}
 
-	# print the original data
-	logger.debug(json.dumps(serp_data, indent=2))
+	# print the original data (only pay for the pretty-printing when debug logging is actually on)
+	if logger.isEnabledFor(logging.DEBUG):
+		logger.debug(orjson.dumps(serp_data, option=orjson.OPT_INDENT_2).decode())
 
 	# to string
-	serp_data_str = json.dumps(serp_data)
+	serp_data_str = orjson.dumps(serp_data).decode()
 
 	return ActionResult(extracted_content=serp_data_str, include_in_memory=False)
 
@@ -91,7 +96,10 @@ async def main():
 	browser_profile = BrowserProfile()
 	agent = Agent(task=task, llm=model, controller=controller, browser_profile=browser_profile)
 
-	history = await agent.run()
+	try:
+		history = await agent.run()
+	finally:
+		await serper_client.aclose()
 
 	result = history.final_result()
 	if result:
@@ -1,23 +1,41 @@
-import asyncio
-import base64
+import binascii
 
 import pytest
+import pytest_asyncio
 from pytest_httpserver import HTTPServer
 
 from browser_use.browser import BrowserProfile, BrowserSession
 from browser_use.dom.views import DOMElementNode
 
+# static test page bodies, built once at import time and shared by every http_server fixture instance
+_HOME_HTML = (
+	b'<html><head><title>Test Home Page</title></head><body><h1>Test Home Page</h1><p>Welcome to the test site</p></body></html>'
+)
+
+_SCROLL_HTML = b"""
+<html>
+<head>
+    <title>Scroll Test</title>
+    <style>
+        body { height: 3000px; }
+        .marker { position: absolute; }
+        #top { top: 0; }
+        #middle { top: 1000px; }
+        #bottom { top: 2000px; }
+    </style>
+</head>
+<body>
+    <div id="top" class="marker">Top of the page</div>
+    <div id="middle" class="marker">Middle of the page</div>
+    <div id="bottom" class="marker">Bottom of the page</div>
+</body>
+</html>
+"""
+
 
 class TestBrowserContext:
 	"""Tests for browser context functionality using real browser instances."""
 
-	@pytest.fixture(scope='module')
-	def event_loop(self):
-		"""Create and provide an event loop for async tests."""
-		loop = asyncio.get_event_loop_policy().new_event_loop()
-		yield loop
-		loop.close()
-
 	@pytest.fixture(scope='module')
 	def http_server(self):
 		"""Create and provide a test HTTP server that serves static content."""
@@ -26,30 +44,12 @@ class TestBrowserContext:
 
 		# Add routes for test pages
 		server.expect_request('/').respond_with_data(
-			'<html><head><title>Test Home Page</title></head><body><h1>Test Home Page</h1><p>Welcome to the test site</p></body></html>',
+			_HOME_HTML,
 			content_type='text/html',
 		)
 
 		server.expect_request('/scroll_test').respond_with_data(
-			"""
-            <html>
-            <head>
-                <title>Scroll Test</title>
-                <style>
-                    body { height: 3000px; }
-                    .marker { position: absolute; }
-                    #top { top: 0; }
-                    #middle { top: 1000px; }
-                    #bottom { top: 2000px; }
-                </style>
-            </head>
-            <body>
-                <div id="top" class="marker">Top of the page</div>
-                <div id="middle" class="marker">Middle of the page</div>
-                <div id="bottom" class="marker">Bottom of the page</div>
-            </body>
-            </html>
-            """,
+			_SCROLL_HTML,
 			content_type='text/html',
 		)
 
@@ -61,8 +61,8 @@ class TestBrowserContext:
 		"""Return the base URL for the test HTTP server."""
 		return f'http://{http_server.host}:{http_server.port}'
 
-	@pytest.fixture(scope='module')
-	async def browser_session(self, event_loop):
+	@pytest_asyncio.fixture(scope='module', loop_scope='module')
+	async def browser_session(self):
 		"""Create and provide a BrowserSession instance with security disabled."""
 		browser_session = BrowserSession(
 			# browser_profile=BrowserProfile(...),
@@ -73,6 +73,15 @@ class TestBrowserContext:
 		yield browser_session
 		await browser_session.stop()
 
+	@pytest_asyncio.fixture(loop_scope='module')
+	async def home_page(self, browser_session, base_url):
+		"""Return the current page on the test home page, only navigating if a previous test left it somewhere else."""
+		page = await browser_session.get_current_page()
+		if page.url != f'{base_url}/':
+			await browser_session.navigate(f'{base_url}/')
+			page = await browser_session.get_current_page()
+		return page
+
 	def test_is_url_allowed(self):
 		"""
 		Test the _is_url_allowed method to verify that it correctly checks URLs against
@@ -106,33 +115,39 @@ class TestBrowserContext:
 		# urlparse will return an empty netloc for some malformed URLs.
 		assert context2._is_url_allowed('notaurl') is False
 
-	def test_convert_simple_xpath_to_css_selector(self):
+	@pytest.mark.parametrize(
+		'xpath,expected',
+		[
+			# empty xpath returns empty string
+			('', ''),
+			# simple xpath without indices
+			('/html/body/div/span', 'html > body > div > span'),
+			# an index on one element: [2] should translate to :nth-of-type(2)
+			('/html/body/div[2]/span', 'html > body > div:nth-of-type(2) > span'),
+			# indices on multiple elements
+			('/ul/li[3]/a[1]', 'ul > li:nth-of-type(3) > a:nth-of-type(1)'),
+		],
+	)
+	def test_convert_simple_xpath_to_css_selector(self, xpath, expected):
 		"""
 		Test the _convert_simple_xpath_to_css_selector method of BrowserSession.
 		This verifies that simple XPath expressions are correctly converted to CSS selectors.
 		"""
-		# Test empty xpath returns empty string
-		assert BrowserSession._convert_simple_xpath_to_css_selector('') == ''
-
-		# Test a simple xpath without indices
-		xpath = '/html/body/div/span'
-		expected = 'html > body > div > span'
-		result = BrowserSession._convert_simple_xpath_to_css_selector(xpath)
-		assert result == expected
-
-		# Test xpath with an index on one element: [2] should translate to :nth-of-type(2)
-		xpath = '/html/body/div[2]/span'
-		expected = 'html > body > div:nth-of-type(2) > span'
-		result = BrowserSession._convert_simple_xpath_to_css_selector(xpath)
-		assert result == expected
-
-		# Test xpath with indices on multiple elements
-		xpath = '/ul/li[3]/a[1]'
-		expected = 'ul > li:nth-of-type(3) > a:nth-of-type(1)'
-		result = BrowserSession._convert_simple_xpath_to_css_selector(xpath)
-		assert result == expected
-
-	def test_enhanced_css_selector_for_element(self):
+		assert BrowserSession._convert_simple_xpath_to_css_selector(xpath) == expected
+
+	@pytest.mark.parametrize(
+		'include_dynamic_attributes,expected_selector',
+		[
+			# the conversion includes the xpath conversion, class attributes, and other attributes
+			(
+				True,
+				'html > body > div:nth-of-type(2).foo.bar[id="my-id"][placeholder*="some \\"quoted\\" text"][data-testid="123"]',
+			),
+			# classes and dynamic attributes like data-testid are left out
+			(False, 'html > body > div:nth-of-type(2)[id="my-id"][placeholder*="some \\"quoted\\" text"]'),
+		],
+	)
+	def test_enhanced_css_selector_for_element(self, include_dynamic_attributes, expected_selector):
 		"""
 		Test the _enhanced_css_selector_for_element method to verify that
 		it returns the correct CSS selector string for a DOMElementNode.
@@ -147,16 +162,12 @@ class TestBrowserContext:
 			children=[],
 		)
 
-		# Call the method with include_dynamic_attributes=True
-		actual_selector = BrowserSession._enhanced_css_selector_for_element(dummy_element, include_dynamic_attributes=True)
-
-		# Expected conversion includes the xpath conversion, class attributes, and other attributes
-		expected_selector = (
-			'html > body > div:nth-of-type(2).foo.bar[id="my-id"][placeholder*="some \\"quoted\\" text"][data-testid="123"]'
+		actual_selector = BrowserSession._enhanced_css_selector_for_element(
+			dummy_element, include_dynamic_attributes=include_dynamic_attributes
 		)
 		assert actual_selector == expected_selector, f'Expected {expected_selector}, but got {actual_selector}'
 
-	@pytest.mark.asyncio
+	@pytest.mark.asyncio(loop_scope='module')
 	async def test_navigate_and_get_current_page(self, browser_session, base_url):
 		"""Test that navigate method changes the URL and get_current_page returns the proper page."""
 		# Navigate to the test page
@@ -172,14 +183,11 @@ class TestBrowserContext:
 		title = await page.title()
 		assert title == 'Test Home Page'
 
-	@pytest.mark.asyncio
-	async def test_refresh_page(self, browser_session, base_url):
+	@pytest.mark.asyncio(loop_scope='module')
+	async def test_refresh_page(self, browser_session, home_page):
 		"""Test that refresh_page correctly reloads the current page."""
-		# Navigate to the test page
-		await browser_session.navigate(f'{base_url}/')
-
 		# Get the current page before refresh
-		page_before = await browser_session.get_current_page()
+		page_before = home_page
 
 		# Refresh the page
 		await browser_session.refresh()
@@ -194,12 +202,9 @@ class TestBrowserContext:
 		title = await page_after.title()
 		assert title == 'Test Home Page'
 
-	@pytest.mark.asyncio
-	async def test_execute_javascript(self, browser_session, base_url):
+	@pytest.mark.asyncio(loop_scope='module')
+	async def test_execute_javascript(self, browser_session, home_page):
 		"""Test that execute_javascript correctly executes JavaScript in the current page."""
-		# Navigate to a test page
-		await browser_session.navigate(f'{base_url}/')
-
 		# Execute a simple JavaScript snippet that returns a value
 		result = await browser_session.execute_javascript('document.title')
 
@@ -213,7 +218,7 @@ class TestBrowserContext:
 		bg_color = await browser_session.execute_javascript('document.body.style.backgroundColor')
 		assert bg_color == 'red'
 
-	@pytest.mark.asyncio
+	@pytest.mark.asyncio(loop_scope='module')
 	async def test_get_scroll_info(self, browser_session, base_url):
 		"""Test that get_scroll_info returns the correct scroll position information."""
 		# Navigate to the scroll test page
@@ -227,9 +232,11 @@ class TestBrowserContext:
 		assert pixels_above_initial == 0, 'Initial scroll position should be at the top'
 		assert pixels_below_initial > 0, 'There should be content below the viewport'
 
-		# Scroll down the page
-		await browser_session.execute_javascript('window.scrollBy(0, 500)')
-		await asyncio.sleep(0.2)  # Brief delay for scroll to complete
+		# Scroll down the page, then resolve once two animation frames have passed and the scroll position has settled
+		await page.evaluate(
+			'new Promise(resolve => { window.scrollBy(0, 500); '
+			'requestAnimationFrame(() => requestAnimationFrame(() => resolve(window.scrollY))); })'
+		)
 
 		# Get new scroll info
 		pixels_above_after_scroll, pixels_below_after_scroll = await browser_session.get_scroll_info(page)
@@ -239,7 +246,7 @@ class TestBrowserContext:
 		assert pixels_above_after_scroll >= 400, 'Page should be scrolled down at least 400px'
 		assert pixels_below_after_scroll < pixels_below_initial, 'Less content should be below viewport after scrolling'
 
-	@pytest.mark.asyncio
+	@pytest.mark.asyncio(loop_scope='module')
 	async def test_take_screenshot(self, browser_session, base_url):
 		"""Test that take_screenshot returns a valid base64 encoded image."""
 		# Navigate to the test page
@@ -252,15 +259,15 @@ class TestBrowserContext:
 		assert isinstance(screenshot_base64, str)
 		assert len(screenshot_base64) > 0
 
-		# Verify it can be decoded as base64
+		# Verify it can be decoded as base64, only the first 12 chars (= first 9 bytes) are needed for the header check
 		try:
-			image_data = base64.b64decode(screenshot_base64)
+			header = binascii.a2b_base64(screenshot_base64[:12])
 			# Verify the data starts with a valid image signature (PNG file header)
-			assert image_data[:8] == b'\x89PNG\r\n\x1a\n', 'Screenshot is not a valid PNG image'
+			assert header.startswith(b'\x89PNG\r\n\x1a\n'), 'Screenshot is not a valid PNG image'
 		except Exception as e:
 			pytest.fail(f'Failed to decode screenshot as base64: {e}')
 
-	@pytest.mark.asyncio
+	@pytest.mark.asyncio(loop_scope='module')
 	async def test_switch_tab_operations(self, browser_session, base_url):
 		"""Test tab creation, switching, and closing operations."""
 		# Navigate to home page in first tab
@@ -288,46 +295,41 @@ class TestBrowserContext:
 		await browser_session.close_tab(1)
 
 		# Verify we only have one tab left
-		tabs_info = await browser_session.get_tabs_info()
-		assert len(tabs_info) == 1, 'Should have one tab open after closing the second'
+		assert len(browser_session.tabs) == 1, 'Should have one tab open after closing the second'
 
-	@pytest.mark.asyncio
+	@pytest.mark.asyncio(loop_scope='module')
 	async def test_remove_highlights(self, browser_session, base_url):
 		"""Test that remove_highlights successfully removes highlight elements."""
 		# Navigate to a test page
 		await browser_session.navigate(f'{base_url}/')
+		page = await browser_session.get_current_page()
 
-		# Add a highlight via JavaScript
-		await browser_session.execute_javascript("""
-            const container = document.createElement('div');
-            container.id = 'playwright-highlight-container';
-            document.body.appendChild(container);
-            
-            const highlight = document.createElement('div');
-            highlight.id = 'playwright-highlight-1';
-            container.appendChild(highlight);
-            
-            const element = document.querySelector('h1');
-            element.setAttribute('browser-user-highlight-id', 'playwright-highlight-1');
-        """)
+		# Add a highlight via JavaScript and verify the highlight container exists in the same round-trip
+		container_exists = await page.evaluate("""
+            (() => {
+                const container = document.createElement('div');
+                container.id = 'playwright-highlight-container';
+                document.body.appendChild(container);
 
-		# Verify the highlight container exists
-		container_exists = await browser_session.execute_javascript(
-			"document.getElementById('playwright-highlight-container') !== null"
-		)
+                const highlight = document.createElement('div');
+                highlight.id = 'playwright-highlight-1';
+                container.appendChild(highlight);
+
+                const element = document.querySelector('h1');
+                element.setAttribute('browser-user-highlight-id', 'playwright-highlight-1');
+
+                return document.getElementById('playwright-highlight-container') !== null;
+            })()
+        """)
 		assert container_exists, 'Highlight container should exist before removal'
 
 		# Call remove_highlights
 		await browser_session.remove_highlights()
 
-		# Verify the highlight container was removed
-		container_exists_after = await browser_session.execute_javascript(
-			"document.getElementById('playwright-highlight-container') !== null"
+		# Verify the highlight container and the highlight attribute were both removed, checked in one round-trip
+		container_exists_after, attribute_exists = await page.evaluate(
+			"[document.getElementById('playwright-highlight-container') !== null, "
+			"document.querySelector('h1').hasAttribute('browser-user-highlight-id')]"
 		)
 		assert not container_exists_after, 'Highlight container should be removed'
-
-		# Verify the highlight attribute was removed from the element
-		attribute_exists = await browser_session.execute_javascript(
-			"document.querySelector('h1').hasAttribute('browser-user-highlight-id')"
-		)
 		assert not attribute_exists, 'browser-user-highlight-id attribute should be removed'
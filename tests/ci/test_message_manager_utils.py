@@ -0,0 +1,34 @@
+import pytest
+
+from browser_use.agent.message_manager.utils import extract_json_from_model_output
+
+
+@pytest.mark.parametrize(
+	'content',
+	[
+		'{"current_state": {"next_goal": "x"}, "action": []}',
+		'```json\n{"current_state": {"next_goal": "x"}, "action": []}\n```',
+		'```\n{"current_state": {"next_goal": "x"}, "action": []}\n```',
+		'Here is my answer:\n```json\n{"current_state": {"next_goal": "x"}, "action": []}\n```\nDone.',
+		# truncated output without a closing fence
+		'```json\n{"current_state": {"next_goal": "x"}, "action": []}',
+		# CRLF line endings
+		'```json\r\n{"current_state": {"next_goal": "x"}, "action": []}\r\n```',
+		# anything on the fence line is treated as the language tag
+		'```json5\n{"current_state": {"next_goal": "x"}, "action": []}\n```',
+		'```python-json\n{"current_state": {"next_goal": "x"}, "action": []}\n```',
+		'``` json\n{"current_state": {"next_goal": "x"}, "action": []}\n```',
+		'```JSON \n{"current_state": {"next_goal": "x"}, "action": []}',
+		# some models wrap the dict in a single-item list
+		'```json\n[{"current_state": {"next_goal": "x"}, "action": []}]\n```',
+	],
+)
+def test_extract_json_from_model_output(content: str):
+	"""Test that JSON is extracted from plain output and from fenced code blocks"""
+	assert extract_json_from_model_output(content) == {'current_state': {'next_goal': 'x'}, 'action': []}
+
+
+def test_extract_json_from_model_output_invalid():
+	"""Test that unparseable output raises a ValueError"""
+	with pytest.raises(ValueError):
+		extract_json_from_model_output('```json\nnot json at all\n```')